@@ -1,13 +1,45 @@
-import aiofiles
-import re
-from utils.type_helpers import uint8, uint16, uint32, uint64, int32, int64
+import asyncio
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
 
 # Example
 # 80010008 EA372703
 # 00140000 00000000
 # 180000E8 0000270F
 
-QC_RE = re.compile(r"^([0-9a-fA-F]){8} ([0-9a-fA-F]){8}$")
+# lookup tables to split the first byte of a line (opcode + type) with bytes.translate
+_HI_NIBBLE = bytes(i >> 4 for i in range(0x100))
+_LO_NIBBLE = bytes(i & 0xF for i in range(0x100))
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_U32BE = struct.Struct(">I")
+
+# address types that are offsets from the pointer (ops 3, 4, 6 and 7)
+_PTR_TYPES = frozenset({0x8, 0x9, 0xA, 0xB, 0xC, 0xD, 0xE, 0xF})
+# op 4 types whose second line holds a 4 digit count (NNNNWWWW)
+_WIDE_COUNT_TYPES = frozenset({0x4, 0x5, 0x6, 0xC, 0xD, 0xE})
+# op C types that are offsets from the pointer, and those that search from 0x0 up to the address
+_C_PTR_TYPES = frozenset({0x8, 0xC})
+_C_UP_TO_TYPES = frozenset({0x4, 0xC})
+
+# search opcodes (8, B and C); a failed search resumes at the next one
+_SEARCH_OPS = frozenset({0x8, 0xB, 0xC})
+
+# array typecodes for the op 4 element sizes
+_ARRAY_CODES = {1: "B", 2: "H", 4: "I"}
+
+# op D test operations: 0 = equal, 1 = not equal, 2 = greater than, 3 = less than
+_TEST_OPS = (operator.eq, operator.ne, operator.gt, operator.lt)
+
+def _int64(n: int) -> int:
+    # wrap to a signed 64-bit value, the width of the pointer
+    return ((n + (1 << 63)) & 0xFFFFFFFFFFFFFFFF) - (1 << 63)
 
 class QuickCodesError(Exception):
     """Exception raised for errors relating to quick codes."""
@@ -20,787 +52,763 @@ class QuickCodes:
         self.filePath = filePath
         self.codes = codes
         self.data = bytearray()
+        self.data_size = 0
+        self.dirty_start = 0
+        self.dirty_end = 0
 
         parts = self.codes.split()
-        try: 
-            self.lines = [f"{parts[i]} {parts[i + 1]}" for i in range(0, len(parts), 2)]
-        except IndexError: 
+        if len(parts) % 2:
             raise QuickCodesError("Invalid code!")
 
+        it = iter(parts)
+        self.lines = [a + " " + b for a, b in zip(it, it)]
+
         for line in self.lines:
-            if not self.validate_code(line):
+            if len(line) != 17 or line[8] != " ":
                 raise QuickCodesError(f"Invalid code: {line}!")
 
+        # with the layout checked, decoding every line at once also validates the hex digits
+        try:
+            self.parse_lines()
+        except ValueError:
+            line = next(line for line in self.lines if not self.validate_code(line))
+            raise QuickCodesError(f"Invalid code: {line}!")
+
     @staticmethod
-    def search_data(data: bytearray | bytes, size: int, start: int, search: bytearray | bytes, length: int, count: int) -> int:
-        k = 1
+    def search_data(data: bytearray | bytes, size: int, start: int, search: bytearray | bytes | memoryview, length: int, count: int) -> int:
+        k = 0
         s = search[:length]
+        pos = max(start, 0)
 
-        for i in range(start, size - length + 1):
-            if data[i:i + length] == s:
-                if k == count:
-                    return i
-                k += 1
-        return -1
+        # the first match is by far the most common, and is a single find
+        if count == 1:
+            return data.find(s, pos, size)
+
+        while True:
+            pos = data.find(s, pos, size)
+            if pos < 0:
+                return -1
+            k += 1
+            if k == count:
+                return pos
+            pos += 1
 
     @staticmethod
-    def reverse_search_data(data: bytearray | bytes, size: int, start: int, search: bytearray | bytes, length: int, count: int) -> int:
-        k = 1
+    def reverse_search_data(data: bytearray | bytes, size: int, start: int, search: bytearray | bytes | memoryview, length: int, count: int) -> int:
+        k = 0
         s = search[:length]
-        
-        for i in range(start, -1, -1):
-            if (i + length <= size) and (data[i:i + length] == s) and (k == count):
-                return i
-            elif (i + length <= size) and (data[i:i + length] == s):
-                k += 1
-        return -1
+        if start < 0:
+            return -1
+
+        # a match at i must end by i + length, so the first window covers matches starting at or before start
+        end = min(start + length, size)
+        if count == 1:
+            return data.rfind(s, 0, end)
+
+        while True:
+            pos = data.rfind(s, 0, end)
+            if pos < 0:
+                return -1
+            k += 1
+            if k == count:
+                return pos
+            if pos == 0:
+                return -1
+            end = pos - 1 + length
     
     @staticmethod
     def validate_code(line: str) -> bool:
-        return bool(QC_RE.fullmatch(line))
+        if len(line) != 17 or line[8] != " ":
+            return False
+        # fromhex skips the single space, so 8 decoded bytes means 16 hex digits
+        try:
+            return len(bytes.fromhex(line)) == 8
+        except ValueError:
+            return False
+
+    def parse_lines(self) -> None:
+        """Decode every line in one pass into the raw code bytes and per-line opcode, type, address and value tuples."""
+        raw = bytes.fromhex("".join(self.lines))
+        # 8 bytes per line, for codes that carry raw bytes on their extra lines;
+        # viewed so those bytes can be handed out without copying (bytes never resize)
+        self._raw = memoryview(raw)
+
+        heads = raw[0::8]
+        # opcodes stay a bytes of their own for the dispatch in apply_code
+        self._op = heads.translate(_HI_NIBBLE)
+        types = heads.translate(_LO_NIBBLE)
+
+        raw = bytearray(raw)
+        raw[0::8] = bytes(len(heads))
+        words = array("I", raw)
+        if sys.byteorder == "little":
+            words.byteswap()
+        # one (opcode, type, address, value) tuple per line, unpacked by the handlers in a single step
+        self._codes = list(zip(self._op, types, words[0::2], words[1::2]))
+
+        # lines a failed search can resume at: 8/B/C codes that don't search from the pointer;
+        # found by stepping over every code's own lines, so needle and payload lines are never taken for codes
+        resume = []
+        i = 0
+        while i < len(heads):
+            op, t, addr, val = self._codes[i]
+            if op in _SEARCH_OPS and t != 0x8:
+                resume.append(i)
+
+            if op in (0x4, 0x5):
+                i += 2
+            elif op in (0x8, 0xB):
+                i += 1 + len(range(4, addr & 0xFFFF, 8))
+            elif op == 0xA:
+                i += 1 + len(range(0, val, 8))
+            else:
+                i += 1
+
+        # for every line, where a search failing on it resumes: the next of those codes, or the end of the codes;
+        # filled a run at a time from the code starts, so no line is ever tested on its own
+        self._fail_jump = [len(heads)] * len(heads)
+        start = 0
+        for target in resume:
+            self._fail_jump[start:target] = [target] * (target - start)
+            start = target
+
+    @staticmethod
+    def load_file(filePath: str) -> bytearray:
+        with open(filePath, "rb") as savegame:
+            if not os.fstat(savegame.fileno()).st_size:
+                return bytearray()
+            # copy straight from the page cache into the working buffer, no intermediate bytes object
+            with mmap.mmap(savegame.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return bytearray(mapped)
 
     async def read_file(self) -> None:
-        async with aiofiles.open(self.filePath, "rb") as savegame:
-            self.data.extend(await savegame.read())
+        self.data = await asyncio.to_thread(self.load_file, self.filePath)
+
+    @staticmethod
+    def save_file(filePath: str, data: bytearray, start: int, end: int) -> None:
+        # the save never changes size, so only the written span has to go back into the file
+        with open(filePath, "r+b") as savegame, memoryview(data)[start:end] as changed:
+            savegame.seek(start)
+            savegame.write(changed)
 
     async def write_file(self) -> None:
-        async with aiofiles.open(self.filePath, "wb") as savegame:
-            await savegame.write(self.data)
+        if self.dirty_start < self.dirty_end:
+            await asyncio.to_thread(self.save_file, self.filePath, self.data, self.dirty_start, self.dirty_end)
+
+    def _write(self, line_index: int) -> int:
+        #	8-bit write
+        #	0TXXXXXX 000000YY
+        #   16-bit write
+        #   1TXXXXXX 0000YYYY
+        #   32-bit write
+        #   2TXXXXXX YYYYYYYY
+        #   X= Address/Offset
+        #   Y= Value to write
+        #   T=Address/Offset type (0 = Normal / 8 = Offset From Pointer)
+        # the opcode is log2 of the write width
+        op, t, off, val = self._codes[line_index]
+        if t == 0x8:
+            off += self.pointer
+
+        self._check_write(off, 1 << op)
+        if op == 0x0:
+            self.data[off] = val & 0xFF
+        elif op == 0x1:
+            _U16.pack_into(self.data, off, val & 0xFFFF)
+        else:
+            _U32.pack_into(self.data, off, val)
+
+        return line_index + 1
+
+    def _increase_decrease(self, line_index: int) -> int:
+        #	Increase / Decrease Write
+        #	Increases or Decreases a specified amount of data from a specific Address
+        #	This does not add/remove Bytes into the save, it just adjusts the value of the Bytes already in it
+        #	For the 8 Byte Value Type, it will write 4 Bytes of data but will continue to write the bytes afterwards if it cannot write any more.
+        #	3BYYYYYY XXXXXXXX
+        #	B = Byte Value & Offset Type
+        #	0 = Add 1 Byte  (000000XX)
+        #	1 = Add 2 Bytes (0000XXXX)
+        #	2 = Add 4 Bytes
+        #	3 = Add 8 Bytes
+        #	4 = Sub 1 Byte  (000000XX)
+        #	5 = Sub 2 Bytes (0000XXXX)
+        #	6 = Sub 4 Bytes
+        #	7 = Sub 8 Bytes
+        #	8 = Offset from Pointer; Add 1 Byte  (000000XX)
+        #	9 = Offset from Pointer; Add 2 Bytes (0000XXXX)
+        #	A = Offset from Pointer; Add 4 Bytes
+        #	B = Offset from Pointer; Add 8 Bytes
+        #	C = Offset from Pointer; Sub 1 Byte  (000000XX)
+        #	D = Offset from Pointer; Sub 2 Bytes (0000XXXX)
+        #	E = Offset from Pointer; Sub 4 Bytes
+        #	F = Offset from Pointer; Sub 8 Bytes
+        #	Y = Address
+        #	X = Bytes to Add/Sub
+        _, t, write, val = self._codes[line_index]
+        if t in _PTR_TYPES:
+            write += self.pointer
+
+        # the low 2 bits of the type are log2 of the value width
+        self._check_write(write, 1 << (t & 0x3))
+
+        match t:
+            case 0x0 | 0x8:
+                self.data[write] = (self.data[write] + val) & 0xFF
+
+            case 0x1 | 0x9:
+                wv16 = _U16.unpack_from(self.data, write)[0]
+                _U16.pack_into(self.data, write, (wv16 + val) & 0xFFFF)
+
+            case 0x2 | 0xA:
+                wv32 = _U32.unpack_from(self.data, write)[0]
+                _U32.pack_into(self.data, write, (wv32 + val) & 0xFFFFFFFF)
+
+            case 0x3 | 0xB:
+                wv64 = _U64.unpack_from(self.data, write)[0]
+                _U64.pack_into(self.data, write, (wv64 + val) & 0xFFFFFFFFFFFFFFFF)
+
+            case 0x4 | 0xC:
+                self.data[write] = (self.data[write] - val) & 0xFF
+
+            case 0x5 | 0xD:
+                wv16 = _U16.unpack_from(self.data, write)[0]
+                _U16.pack_into(self.data, write, (wv16 - val) & 0xFFFF)
+
+            case 0x6 | 0xE:
+                wv32 = _U32.unpack_from(self.data, write)[0]
+                _U32.pack_into(self.data, write, (wv32 - val) & 0xFFFFFFFF)
+
+            case 0x7 | 0xF:
+                wv64 = _U64.unpack_from(self.data, write)[0]
+                _U64.pack_into(self.data, write, (wv64 - val) & 0xFFFFFFFFFFFFFFFF)
+
+        return line_index + 1
+
+    def _multi_write(self, line_index: int) -> int:
+        #	multi write
+        #	4TXXXXXX YYYYYYYY
+        #	4NNNWWWW VVVVVVVV | NNNNWWWW VVVVVVVV
+        #	X= Address/Offset
+        #	Y= Value to write (Starting)
+        #	N=Times to Write
+        #	W=Increase Address By
+        #	V=Increase Value By
+        #	T=Address/Offset type
+        #	Normal/Pointer
+        #	0 / 8 & 4 / C = 8bit
+        #	1 / 9 & 5 / D = 16bit
+        #	2 / A & 6 / E = 32bit
+        _, t, off, val = self._codes[line_index]
+        if t in _PTR_TYPES:
+            off += self.pointer
+
+        line_index += 1
+        n_hi, n_mid, inc, incval = self._codes[line_index]
+
+        # 4NNNWWWW VVVVVVVV
+        n = (n_mid << 8) | (inc >> 16)
+        if t in _WIDE_COUNT_TYPES:
+            # NNNNWWWW VVVVVVVV
+            n |= n_hi << 12
+
+        incoff = inc & 0xFFFF
+
+        size = 1 << (t & 0x3)
+        if not n or size not in _ARRAY_CODES:
+            return line_index + 1
+
+        end = off + (incoff * (n - 1)) + size
+        self._check_write(off, end - off)
+
+        if incoff >= size:
+            # the writes do not overlap, so build every value at once and store them with slice assignment
+            mask = (1 << (size * 8)) - 1
+            vals = array(_ARRAY_CODES[size], [(val + incval * i) & mask for i in range(n)])
+            if sys.byteorder == "big":
+                vals.byteswap()
+
+            # store straight from the array's buffer rather than a bytes copy of it
+            if incoff == size:
+                self.data[off:end] = vals
+            else:
+                # one strided store per byte of the element
+                with memoryview(vals) as view, view.cast("B") as packed:
+                    for k in range(size):
+                        self.data[off + k:end:incoff] = packed[k::size]
+        else:
+            for i in range(n):
+                write = off + (incoff * i)
+
+                match t:
+                    case 0x0 | 0x8 | 0x4 | 0xC:
+                        self.data[write] = val & 0xFF
+
+                    case 0x1 | 0x9 | 0x5 | 0xD:
+                        _U16.pack_into(self.data, write, val & 0xFFFF)
+
+                    case 0x2 | 0xA | 0x6 | 0xE:
+                        _U32.pack_into(self.data, write, val)
+
+                val = (val + incval) & 0xFFFFFFFF
+
+        return line_index + 1
+
+    def _copy_bytes(self, line_index: int) -> int:
+        #	copy bytes
+        #	5TXXXXXX ZZZZZZZZ
+        #	5TYYYYYY 00000000
+        #	  XXXXXX = Offset to copy from
+        #	  YYYYYY = Offset to copy to
+        #	         ZZZZZZZZ = Number of bytes to copy
+        #	 T = Bit Size
+        #	 0 = From start of the data
+        #	 8 = From found from a search
+        _, t, src, val = self._codes[line_index]
+        if t == 0x8:
+            src += self.pointer
+
+        line_index += 1
+
+        _, t, dst, _ = self._codes[line_index]
+        if t == 0x8:
+            dst += self.pointer
+
+        # a source running off the end would shorten the copy and shrink the save
+        if src < 0 or src + val > self.data_size:
+            raise QuickCodesError("Invalid code!")
+        self._check_write(dst, val)
+
+        # copy within one view of the save (a memmove, safe for overlapping ranges) instead of through a temporary bytes;
+        # both ranges are checked, so the slice lengths always match
+        with memoryview(self.data) as view:
+            view[dst:dst + val] = view[src:src + val]
+
+        return line_index + 1
+
+    def _pointer_code(self, line_index: int) -> int:
+        #	special mega code
+        #	6TWX0Y0Z VVVVVVVV <- Code Type 6
+        #	6 = Type 6: Pointer codes
+        #	T = Data size of VVVVVVVV: 0:8bit, 1:16bit, 2:32bit, search-> 8:8bit, 9:16bit, A:32bit
+        #	W = operator:
+        #	      0X = Read "address" from file (X = 0:none, 1:add, 2:multiply)
+        #	      1X = Move pointer from obtained address ?? (X = 0:add, 1:substract, 2:multiply)
+        #	      2X = Move pointer ?? (X = 0:add, 1:substract, 2:multiply)
+        #	      4X = Write value: X=0 at read address, X=1 at pointer address
+        #	Y = flag relative to read add (very tricky to understand; 0=absolute, 1=pointer)
+        #	Z = flag relative to current pointer (very tricky to understand)
+        #	V = Data
+        _, t, addr, val = self._codes[line_index]
+        w = (addr >> 20) & 0xF
+        x = (addr >> 16) & 0xF
+        y = (addr >> 8) & 0xF
+        z = addr & 0xF
+
+        write = 0
+        off = 0
+
+        if t in _PTR_TYPES:
+            off += self.pointer
+
+        match w:
+            case 0x0:
+                # 0X = Read "address" from file (X = 0:none, 1:add, 2:multiply)
+                if x == 0x1:
+                    val = (val + self.ptr) & 0xFFFFFFFF
+                write += (val + off)
+
+                if y == 0x1:
+                    self.pointer = val
+
+                match t:
+                    case 0x0 | 0x8:
+                        # Data size = 8 bits
+                        # 000000VV
+                        self.ptr = self.data[write]
+
+                    case 0x1 | 0x9:
+                        # Data size = 16 bits
+                        # 0000VVVV
+                        self.ptr = _U16.unpack_from(self.data, write)[0]
+
+                    case 0x2 | 0xA:
+                        # Data size = 32 bits
+                        # VVVVVVVV
+                        self.ptr = _U32.unpack_from(self.data, write)[0]
+
+            case 0x1:
+                # 1X = Move pointer from obtained address ?? (X = 0:add, 1:substract, 2:multiply)
+                match x:
+                    case 0x0:
+                        self.ptr = (self.ptr + val) & 0xFFFFFFFF
+
+                    case 0x1:
+                        self.ptr = (self.ptr - val) & 0xFFFFFFFF
+
+                    case 0x2:
+                        self.ptr = (self.ptr * val) & 0xFFFFFFFF
+
+                if z == 0x1:
+                    self.ptr = (self.ptr + self.pointer) & 0xFFFFFFFF
+                self.pointer = self.ptr
+
+            case 0x2:
+                # 2X = Move pointer ?? (X = 0:add, 1:substract, 2:multiply)
+                match x:
+                    case 0x0:
+                        self.pointer = _int64(self.pointer + val)
+
+                    case 0x1:
+                        self.pointer = _int64(self.pointer - val)
+
+                    case 0x2:
+                        self.pointer = _int64(self.pointer * val)
+
+                if y == 0x1:
+                    self.ptr = self.pointer & 0xFFFFFFFF
+
+            case 0x4:
+                # 4X = Write value: X=0 at read address, X=1 at pointer address
+                write += self.pointer
+
+                match t:
+                    case 0x0 | 0x8:
+                        self._check_write(write, 1)
+                        self.data[write] = val & 0xFF
+
+                    case 0x1 | 0x9:
+                        self._check_write(write, 2)
+                        _U16.pack_into(self.data, write, val & 0xFFFF)
+
+                    case 0x2 | 0xA:
+                        self._check_write(write, 4)
+                        _U32.pack_into(self.data, write, val)
+
+        return line_index + 1
+
+    def _max_min_write(self, line_index: int) -> int:
+        #	Writes Bytes up to a specified Maximum/Minimum to a specific Address
+        #	This code is the same as a standard write code however it will only write the bytes if the current value at the address is no more or no less than X.
+        #	For example, you can use a no less than value to make sure the address has more than X but will take no effect if it already has more than the value on the save.
+        #	7BYYYYYY XXXXXXXX
+        #	B = Byte Value & Offset Type
+        #	0 = No Less Than: 1 Byte  (000000XX)
+        #	1 = No Less Than: 2 Bytes (0000XXXX)
+        #	2 = No Less Than: 4 Bytes
+        #	4 = No More Than: 1 Byte  (000000XX)
+        #	5 = No More Than: 2 Bytes (0000XXXX)
+        #	6 = No More Than: 4 Bytes
+        #	8 = Offset from Pointer; No Less Than: 1 Byte  (000000XX)
+        #	9 = Offset from Pointer; No Less Than: 2 Bytes (0000XXXX)
+        #	A = Offset from Pointer; No Less Than: 4 Bytes
+        #	C = Offset from Pointer; No More Than: 1 Byte  (000000XX)
+        #	D = Offset from Pointer; No More Than: 2 Bytes (0000XXXX)
+        #	E = Offset from Pointer; No More Than: 4 Bytes
+        #	Y = Address
+        #	X = Bytes to Write
+        _, t, write, val = self._codes[line_index]
+        if t in _PTR_TYPES:
+            write += self.pointer
+
+        # types 3, 7, B and F have no write
+        if t & 0x3 == 0x3:
+            return line_index + 1
+
+        self._check_write(write, 1 << (t & 0x3))
+
+        match t:
+            case 0x0 | 0x8:
+                self.data[write] = max(self.data[write], val & 0x000000FF)
+
+            case 0x1 | 0x9:
+                wv16 = _U16.unpack_from(self.data, write)[0]
+                _U16.pack_into(self.data, write, max(wv16, val & 0x0000FFFF))
+
+            case 0x2 | 0xA:
+                wv32 = _U32.unpack_from(self.data, write)[0]
+                _U32.pack_into(self.data, write, max(wv32, val))
+
+            case 0x4 | 0xC:
+                self.data[write] = min(self.data[write], val & 0x000000FF)
+
+            case 0x5 | 0xD:
+                wv16 = _U16.unpack_from(self.data, write)[0]
+                _U16.pack_into(self.data, write, min(wv16, val & 0x0000FFFF))
+
+            case 0x6 | 0xE:
+                wv32 = _U32.unpack_from(self.data, write)[0]
+                _U32.pack_into(self.data, write, min(wv32, val))
+
+        return line_index + 1
+
+    def _search(self, line_index: int) -> int:
+        #	Search Type
+        #	8TZZXXXX YYYYYYYY
+        #	T= Address/Offset type (0 = Normal / 8 = Offset From Pointer)
+        #	Z= Amount of times to find before Write
+        #	X= Amount of data to Match
+        #	Y= Seach For (note can be extended for more just continue it like YYYYYYYY YYYYYYYY under it)
+        #	Once u have your Search type done then place one of the standard code types under it with setting T to the Pointer type
+        _, t, head, _ = self._codes[line_index]
+        cnt = (head >> 16) or 1
+        length = head & 0xFFFF
+
+        find, line_index = self._code_bytes(line_index, 4, length)
+
+        self.pointer = self.search_data(self.data, self.data_size, self.pointer if t == 0x8 else 0, find, length, cnt)
+
+        if self.pointer < 0:
+            self.pointer = 0
+            return self._fail_jump[line_index]
+
+        return line_index + 1
+
+    def _pointer_manipulator(self, line_index: int) -> int:
+        #	Pointer Manipulator (Set/Move Pointer)
+        #	Adjusts the Pointer Offset using numerous Operators
+        #	9Y000000 XXXXXXXX
+        #	Y = Operator
+        #	0 = Set Pointer to Big Endian value at XXXXXXXX
+        #	1 = Set Pointer to Little Endian value at XXXXXXXX
+        #	2 = Add X to Pointer
+        #	3 = Sub X to Pointer
+        #	4 = Set Pointer to the end of file and subtract X
+        #	5 = Set Pointer to X
+        #	D = Set End Address = to X
+        #	E = Set End Address From Pointer + X
+        #	X = Value to set / change
+        #	---
+        #	Move pointer to offset in address XXXXXXXXX (CONFIRMED CODE)
+        #	90000000 XXXXXXXX
+        #	---
+        #	Step Forward Code (CONFIRMED CODE)
+        #	92000000 XXXXXXXX
+        #	---
+        #	Step Back Code (CONFIRMED CODE)
+        #	93000000 XXXXXXXX
+        #	---
+        #	Step Back From End of File Code (CONFIRMED CODE)
+        #	94000000 XXXXXXXX
+        _, t, _, off = self._codes[line_index]
+
+        match t:
+            case 0x0:
+                self.pointer = _U32BE.unpack_from(self.data, off)[0]
+
+            case 0x1:
+                self.pointer = _U32.unpack_from(self.data, off)[0]
+
+            case 0x2:
+                self.pointer = _int64(self.pointer + off)
+
+            case 0x3:
+                self.pointer = _int64(self.pointer - off)
+
+            case 0x4: 
+                self.pointer = self.data_size - off
+
+            case 0x5:
+                self.pointer = off
+
+            case 0xD:
+                self.end_pointer = off
+
+            case 0xE:
+                self.end_pointer = (self.pointer + off) & 0xFFFFFFFFFFFFFFFF
+
+        return line_index + 1
+
+    def _multi_write_bytes(self, line_index: int) -> int:
+        #	Multi-write
+        #	ATxxxxxx yyyyyyyy  (xxxxxx = address, yyyyyyyy = size)
+        #	zzzzzzzz zzzzzzzz  <-data to write at address
+        #	T= Address/Offset type (0 = Normal / 8 = Offset From Pointer)
+        _, t, off, size = self._codes[line_index]
+        if t == 0x8:
+            off += self.pointer
+
+        write, line_index = self._code_bytes(line_index, 8, size)
+
+        self._check_write(off, size)
+        self.data[off:off + size] = write
+
+        return line_index + 1
+
+    def _reverse_search(self, line_index: int) -> int:
+        #	Backward Byte Search (Set Pointer)
+        #	Searches Backwards for a specified Value and saves the Value's Address as the Pointer Offset
+        #	Will start from the end of the save file, but can be changed using a previous Pointer Offset
+        #	BTCCYYYY XXXXXXXX
+        #	*Other Code Here, Use Specific Offset Type*
+        #	T = Offset Type
+        #	0 = Default
+        #	8 = Offset from Pointer
+        #	C = Amount of Times to Find until Pointer Set
+        #	Y = Amount of Bytes to Search
+        #	1 = 1 Byte
+        #	2 = 2 Bytes
+        #	and so on...
+        #	X = Bytes to Search, use Multiple Lines if Needed
+        _, t, head, _ = self._codes[line_index]
+        cnt = (head >> 16) or 1
+        length = head & 0xFFFF
+
+        if not self.end_pointer: 
+            self.end_pointer = (self.data_size - 1) & 0xFFFFFFFFFFFFFFFF
+
+        find, line_index = self._code_bytes(line_index, 4, length)
+
+        self.pointer = self.reverse_search_data(self.data, self.data_size, self.pointer if t == 0x8 else self.end_pointer, find, length, cnt)
+
+        if self.pointer < 0:
+            self.pointer = 0
+            return self._fail_jump[line_index]
+
+        return line_index + 1
+
+    def _address_search(self, line_index: int) -> int:
+        #	Address Byte Search (Set Pointer)
+        #	Searches for a Value from a specified Address and saves the new Value's Address as the Pointer Offset
+        #	Rather than searching for Bytes already given such as code types 8 and B, this code will instead search using the bytes at a specific Address
+        #	CBFFYYYY XXXXXXXX
+        #	*Other Code Here, Use Specific Offset Type*
+        #	B = Offset Type
+        #	0 = Search Forwards from Address Given
+        #	4 = Search from 0x0 to Address Given
+        #	8 = Offset from Pointer; Search Forwards from Address Given
+        #	C = Offset from Pointer; Search from 0x0 to Address Given
+        #	F = Amount of Times to Find until Pointer Set
+        #	Y = Amount of Bytes to Search from Address
+        #	1 = 1 Byte
+        #	2 = 2 Bytes
+        #	and so on...
+        #	X = Address of Bytes to Search with
+        _, t, head, addr = self._codes[line_index]
+        cnt = (head >> 16) or 1
+        length = head & 0xFFFF
+        if t in _C_PTR_TYPES:
+            addr += self.pointer
+
+        # a needle running off the save would be cut short, and find matches a short or empty needle anywhere
+        if addr < 0 or addr + length > self.data_size:
+            raise QuickCodesError("Invalid code!")
+
+        # view just the bytes to search with instead of copying the rest of the save;
+        # released before the next code runs
+        with memoryview(self.data)[addr:addr + length] as find:
+            if t in _C_UP_TO_TYPES:
+                self.pointer = self.search_data(self.data, addr + length, 0, find, length, cnt)
+            else:
+                self.pointer = self.search_data(self.data, self.data_size, addr + length, find, length, cnt)
+
+        if self.pointer < 0:
+            self.pointer = 0
+            return self._fail_jump[line_index]
+
+        return line_index + 1
+
+    def _test(self, line_index: int) -> int:
+        #	2 Byte Test Commands (Code Skipper)
+        #	Test a specific Address using an Operation; skips the following code lines if Operation fails
+        #	DBYYYYYY CCZDXXXX
+        #	B = Offset Type
+        #	0 = Normal
+        #	8 = Offset from Pointer
+        #	Y = Address to test
+        #	C = Lines of code to skip if test fails
+        #	Z = Value data type
+        #	0 = 16-bit
+        #	1 = 8-bit
+        #	D = Test Operation
+        #	0 = Equal
+        #	1 = Not Equal
+        #	2 = Greater Than (Value at the Address is greater than the tested value)
+        #	3 = Less Than (Value at the Address is less than the tested value)
+        #	X = Value to test
+        _, t, off, test = self._codes[line_index]
+        op = (test >> 16) & 0xF
+        bit = (test >> 20) & 0xF
+
+        if t == 0x8:
+            off += self.pointer
+
+        l = test >> 24
+        val = test & 0xFFFF
+
+        if bit == 0x1:
+            val &= 0xFF
+            src = self.data[off]
+        else:
+            src = _U16.unpack_from(self.data, off)[0]
+
+        # unknown test operations always pass
+        if op > 0x3 or _TEST_OPS[op](src, val):
+            return line_index + 1
+
+        # skip the l lines under the test, which have to exist
+        if line_index + l >= len(self.lines):
+            raise QuickCodesError("Invalid code!")
+
+        return line_index + l + 1
+
+    def _check_write(self, off: int, size: int) -> None:
+        # a negative offset would wrap around to the end of the save and a slice past the end would grow it
+        end = off + size
+        if off < 0 or end > self.data_size:
+            raise QuickCodesError("Invalid code!")
+
+        # widen the span write_file puts back
+        if off < self.dirty_start:
+            self.dirty_start = off
+        if end > self.dirty_end:
+            self.dirty_end = end
+
+    def _code_bytes(self, line_index: int, start: int, size: int) -> tuple[memoryview, int]:
+        # size bytes of the code from start within line line_index, running on into the lines under it;
+        # also returns the index of the last line used
+        begin = line_index * 8 + start
+        last = (begin + size - 1) // 8 if size > 0 else line_index
+        if last >= len(self.lines):
+            raise QuickCodesError("Invalid code!")
+
+        return self._raw[begin:begin + size], max(last, line_index)
+
+    def _skip(self, line_index: int) -> int:
+        # E and F are not code types
+        return line_index + 1
+
+    # handlers indexed by opcode, each returns the index of the next line to run
+    _HANDLERS = (
+        _write, _write, _write, _increase_decrease, _multi_write, _copy_bytes, _pointer_code, _max_min_write,
+        _search, _pointer_manipulator, _multi_write_bytes, _reverse_search, _address_search, _test, _skip, _skip
+    )
 
     async def apply_code(self) -> None:
-        pointer = int64()
-        end_pointer = uint64()
-        ptr = uint32()
+        self.pointer = 0
+        self.end_pointer = 0
+        self.ptr = 0
 
         await self.read_file()
+        # no write may resize the save, so its length is fixed for the whole run
+        self.data_size = len(self.data)
+        # nothing written yet
+        self.dirty_start = self.data_size
+        self.dirty_end = 0
+
+        # the codes don't change during the run, so look up what the loop needs once
+        handlers = self._HANDLERS
+        ops = self._op
+        count = len(self.lines)
 
         line_index = 0
-        while line_index < len(self.lines):
-            line = self.lines[line_index]
-        
-            try:
-                match line[0]:
-                    case "0" | "1" | "2":
-                        #	8-bit write
-    			        #	0TXXXXXX 000000YY
-                        #   16-bit write
-    				    #   1TXXXXXX 0000YYYY
-                        #   32-bit write
-                        #   2TXXXXXX YYYYYYYY
-                        #   X= Address/Offset
-                        #   Y= Value to write
-                        #   T=Address/Offset type (0 = Normal / 8 = Offset From Pointer)
-                        bytes_ = uint8(1 << (ord(line[0]) - 0x30)).value
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-                        if line[1] == "8":
-                            off.value += pointer.value
-                        off = off.value
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8, "little")
-
-                        self.data[off:off + bytes_] = val.as_bytes[(4 - bytes_):(4 - bytes_) + bytes_]
-
-                    case "3":
-                        #	Increase / Decrease Write
-                        #	Increases or Decreases a specified amount of data from a specific Address
-                        #	This does not add/remove Bytes into the save, it just adjusts the value of the Bytes already in it
-                        #	For the 8 Byte Value Type, it will write 4 Bytes of data but will continue to write the bytes afterwards if it cannot write any more.
-                        #	3BYYYYYY XXXXXXXX
-                        #	B = Byte Value & Offset Type
-                        #	0 = Add 1 Byte  (000000XX)
-                        #	1 = Add 2 Bytes (0000XXXX)
-                        #	2 = Add 4 Bytes
-                        #	3 = Add 8 Bytes
-                        #	4 = Sub 1 Byte  (000000XX)
-                        #	5 = Sub 2 Bytes (0000XXXX)
-                        #	6 = Sub 4 Bytes
-                        #	7 = Sub 8 Bytes
-                        #	8 = Offset from Pointer; Add 1 Byte  (000000XX)
-                        #	9 = Offset from Pointer; Add 2 Bytes (0000XXXX)
-                        #	A = Offset from Pointer; Add 4 Bytes
-                        #	B = Offset from Pointer; Add 8 Bytes
-                        #	C = Offset from Pointer; Sub 1 Byte  (000000XX)
-                        #	D = Offset from Pointer; Sub 2 Bytes (0000XXXX)
-                        #	E = Offset from Pointer; Sub 4 Bytes
-                        #	F = Offset from Pointer; Sub 8 Bytes
-                        #	Y = Address
-                        #	X = Bytes to Add/Sub
-                        t = line[1]
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-                        if t in ["8", "9", "A", "C", "D", "E"]:
-                            off.value += pointer.value
-                        write = off.value
-                        
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8).value
-
-                        match t:
-                            case "0" | "8":
-                                wv8 = self.data[write]
-                                wv8 += (val & 0x000000FF)
-
-                                self.data[write] = wv8
-                            
-                            case "1" | "9":
-                                wv16 = uint16(self.data[write:write + 2], "little")
-                                wv16.value += (val & 0x0000FFFF)
-                                
-                                self.data[write:write + 2] = wv16.as_bytes
-                            
-                            case "2" | "A":
-                                wv32 = uint32(self.data[write:write + 4], "little")
-                                wv32.value += val
-
-                                self.data[write:write + 4] = wv32.as_bytes
-
-                            case "3" | "B":
-                                wv64 = uint64(self.data[write:write + 8], "little")
-                                wv64.value += val
-
-                                self.data[write:write + 8] = wv64.as_bytes
-
-                            case "4" | "C":
-                                wv8 = self.data[write]
-                                wv8 -= (val & 0x000000FF)
-
-                                self.data[write] = wv8
-
-                            case "5" | "D":
-                                wv16 = uint16(self.data[write:write + 2], "little")
-                                wv16.value -= (val & 0x0000FFFF)
-
-                                self.data[write:write + 2] = wv16.as_bytes
-                            
-                            case "6" | "E":
-                                wv32 = uint32(self.data[write:write + 4], "little")
-                                wv32.value -= val
-
-                                self.data[write:write + 4] = wv32.as_bytes
-                            
-                            case "7" | "F":
-                                wv64 = uint64(self.data[write:write + 8], "little")
-                                wv64.value -= val
-
-                                self.data[write:write + 8] = wv64.as_bytes
-                            
-                    case "4":
-                        #	multi write
-                        #	4TXXXXXX YYYYYYYY
-                        #	4NNNWWWW VVVVVVVV | NNNNWWWW VVVVVVVV
-                        #	X= Address/Offset
-                        #	Y= Value to write (Starting)
-                        #	N=Times to Write
-                        #	W=Increase Address By
-                        #	V=Increase Value By
-                        #	T=Address/Offset type
-                        #	Normal/Pointer
-                        #	0 / 8 & 4 / C = 8bit
-                        #	1 / 9 & 5 / D = 16bit
-                        #	2 / A & 6 / E = 32bit
-                        t = line[1]
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-                        if t in ["8", "9", "A", "C", "D", "E"]:
-                            off.value += pointer.value
-                        off = off.value
-                        
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8, "little")
-
-                        line = self.lines[line_index + 1]
-                        line_index += 1
-                        
-                        if t in ["4", "5", "6", "C", "D", "E"]:
-                            # NNNNWWWW VVVVVVVV
-                            tmp4 = line[:4]
-                            n = int32(tmp4).value
-                        else:
-                            # 4NNNWWWW VVVVVVVV
-                            tmp3 = line[1:4]
-                            n = int32(tmp3).value
-
-                        tmp4 = line[4:8]
-                        incoff = int32(tmp4).value
-
-                        tmp8 = line[9:17]
-                        incval = uint32(tmp8).value
-
-                        for i in range(n):
-                            write = off + (incoff * i)
-
-                            match t:
-                                case "0" | "8" | "4" | "C":
-                                    wv8 = uint8(val.value)
-
-                                    self.data[write] = wv8.value
-                                
-                                case "1" | "9" | "5" | "D":
-                                    wv16 = uint16(val.value, "little")
-
-                                    self.data[write:write + 2] = wv16.as_bytes
-                                
-                                case "2" | "A" | "6" | "E":
-                                    wv32 = val
-
-                                    self.data[write:write + 4] = wv32.as_bytes
-                            
-                            val.value += incval
-
-                    case "5":
-                        #	copy bytes
-                        #	5TXXXXXX ZZZZZZZZ
-                        #	5TYYYYYY 00000000
-                        #	  XXXXXX = Offset to copy from
-                        #	  YYYYYY = Offset to copy to
-                        #	         ZZZZZZZZ = Number of bytes to copy
-                        #	 T = Bit Size
-                        #	 0 = From start of the data
-                        #	 8 = From found from a search
-                        tmp6 = line[2:8]
-                        off_src = int32(tmp6).value
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8).value
-
-                        src = off_src
-
-                        if line[1] == "8":
-                            src += pointer.value
-
-                        line = self.lines[line_index + 1]
-                        line_index += 1
-
-                        tmp6 = line[2:8]
-                        off_dst = int32(tmp6).value
-
-                        dst = off_dst
-                        
-                        if line[1] == "8":
-                            dst += pointer.value
-
-                        self.data[dst:dst + val] = self.data[src:src + val]
-                    
-                    case "6":
-                        #	special mega code
-                        #	6TWX0Y0Z VVVVVVVV <- Code Type 6
-                        #	6 = Type 6: Pointer codes
-                        #	T = Data size of VVVVVVVV: 0:8bit, 1:16bit, 2:32bit, search-> 8:8bit, 9:16bit, A:32bit
-                        #	W = operator:
-                        #	      0X = Read "address" from file (X = 0:none, 1:add, 2:multiply)
-                        #	      1X = Move pointer from obtained address ?? (X = 0:add, 1:substract, 2:multiply)
-                        #	      2X = Move pointer ?? (X = 0:add, 1:substract, 2:multiply)
-                        #	      4X = Write value: X=0 at read address, X=1 at pointer address
-                        #	Y = flag relative to read add (very tricky to understand; 0=absolute, 1=pointer)
-                        #	Z = flag relative to current pointer (very tricky to understand)
-                        #	V = Data
-                        t = line[1]
-                        w = line[2]
-                        x = line[3]
-                        y = line[5]
-                        z = line[7]
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8, "little")
-
-                        write = 0
-                        off = 0
-
-                        if t in ["8", "9", "A"]:
-                            off += pointer.value
-
-                        match w:
-                            case "0":
-                                # 0X = Read "address" from file (X = 0:none, 1:add, 2:multiply)
-                                if x == "1":
-                                    val.value += ptr.value
-                                write += (val.value + off)
-                            
-                                if y == "1":
-                                    pointer.value = val.value
-                                
-                                match t:
-                                    case "0" | "8":
-                                        # Data size = 8 bits
-						                # 000000VV
-                                        wv8 = self.data[write]
-                                        ptr.value = wv8
-
-                                    case "1" | "9":
-                                        # Data size = 16 bits
-						                # 0000VVVV
-                                        wv16 = uint16(self.data[write:write + 2], "little")
-                                        ptr.value = wv16.value
-                                    
-                                    case "2" | "A":
-                                        # Data size = 32 bits
-						                # VVVVVVVV
-                                        wv32 = uint32(self.data[write:write + 4], "little")
-                                        ptr.value = wv32.value
-
-                            case "1":
-                                # 1X = Move pointer from obtained address ?? (X = 0:add, 1:substract, 2:multiply)
-                                match x:
-                                    case "0":
-                                        ptr.value += val.value
-                                    
-                                    case "1":
-                                        ptr.value -= val.value
-                                    
-                                    case "2":
-                                        ptr.value *= val.value
-                                
-                                if z == "1":
-                                    ptr.value += pointer.value
-                                pointer.value = ptr.value
-                            
-                            case "2":
-                                # 2X = Move pointer ?? (X = 0:add, 1:substract, 2:multiply)
-                                match x:
-                                    case "0":
-                                        pointer.value += val.value
-                                    
-                                    case "1":
-                                        pointer.value -= val.value
-                                    
-                                    case "2":
-                                        pointer.value *= val.value
-                                    
-                                if y == "1":
-                                    ptr.value = pointer.value
-                            
-                            case "4":
-                                # 4X = Write value: X=0 at read address, X=1 at pointer address
-                                write += pointer.value
-
-                                match t:
-                                    case "0" | "8":
-                                        wv8 = uint8(val.value)
-                        
-                                        self.data[write] = wv8
-                                    
-                                    case "1" | "9":
-                                        wv16 = uint16(val, "little")
-
-                                        self.data[write:write + 2] = wv16.as_bytes
-
-                                    case "2" | "A":
-                                        wv32 = val
-
-                                        self.data[write:write + 4] = wv32.as_bytes
-                    
-                    case "7":
-                        #	Writes Bytes up to a specified Maximum/Minimum to a specific Address
-                        #	This code is the same as a standard write code however it will only write the bytes if the current value at the address is no more or no less than X.
-                        #	For example, you can use a no less than value to make sure the address has more than X but will take no effect if it already has more than the value on the save.
-                        #	7BYYYYYY XXXXXXXX
-                        #	B = Byte Value & Offset Type
-                        #	0 = No Less Than: 1 Byte  (000000XX)
-                        #	1 = No Less Than: 2 Bytes (0000XXXX)
-                        #	2 = No Less Than: 4 Bytes
-                        #	4 = No More Than: 1 Byte  (000000XX)
-                        #	5 = No More Than: 2 Bytes (0000XXXX)
-                        #	6 = No More Than: 4 Bytes
-                        #	8 = Offset from Pointer; No Less Than: 1 Byte  (000000XX)
-                        #	9 = Offset from Pointer; No Less Than: 2 Bytes (0000XXXX)
-                        #	A = Offset from Pointer; No Less Than: 4 Bytes
-                        #	C = Offset from Pointer; No More Than: 1 Byte  (000000XX)
-                        #	D = Offset from Pointer; No More Than: 2 Bytes (0000XXXX)
-                        #	E = Offset from Pointer; No More Than: 4 Bytes
-                        #	Y = Address
-                        #	X = Bytes to Write
-                        t = line[1]
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-
-                        if t in ["8", "9", "A", "C", "D", "E"]:
-                            off.value += pointer.value
-                        write = off.value
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8).value
-
-                        match t:
-                            case "0" | "8":
-                                val &= 0x000000FF
-                                wv8 = self.data[write]
-                                if val > wv8: 
-                                    wv8 = val
-
-                                self.data[write] = wv8
-
-                            case "1" | "9":
-                                val &= 0x0000FFFF
-                                wv16 = uint16(self.data[write:write + 2], "little")
-                                if val > wv16.value: 
-                                    wv16.value = val
-
-                                self.data[write:write + 2] = wv16.as_bytes
-                            
-                            case "2" | "A":
-                                wv32 = uint32(self.data[write:write + 4], "little")
-                                if val > wv32.value: 
-                                    wv32.value = val
-
-                                self.data[write:write + 4] = wv32.as_bytes
-                            
-                            case "4" | "C":
-                                val &= 0x000000FF
-                                wv8 = self.data[write]
-                                if val < wv8: 
-                                    wv8 = val
-
-                                self.data[write] = wv8
-
-                            case "5" | "D":
-                                val &= 0x0000FFFF
-                                wv16 = uint16(self.data[write:write + 2], "little")
-                                if val < wv16.value: 
-                                    wv16.value = val
-
-                                self.data[write:write + 2] = wv16.as_bytes
-
-                            case "6" | "E":
-                                wv32 = uint32(self.data[write:write + 4], "little")
-                                if val < wv32.value: 
-                                    wv32.value = val
-
-                                self.data[write:write + 4] = wv32.as_bytes
-
-                    case "8":
-                        #	Search Type
-                        #	8TZZXXXX YYYYYYYY
-                        #	T= Address/Offset type (0 = Normal / 8 = Offset From Pointer)
-                        #	Z= Amount of times to find before Write
-                        #	X= Amount of data to Match
-                        #	Y= Seach For (note can be extended for more just continue it like YYYYYYYY YYYYYYYY under it)
-                        #	Once u have your Search type done then place one of the standard code types under it with setting T to the Pointer type
-                        t = line[1]
-
-                        tmp3 = line[2:4]
-                        cnt = int32(tmp3).value
-
-                        tmp4 = line[4:8]
-                        length = int32(tmp4).value
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8, "big")
-
-                        find = bytearray((length + 3) & ~3)
-
-                        if not cnt: 
-                            cnt = 1
-
-                        find[:4] = val.as_bytes
-
-                        for i in range(4, length, 8):
-                            line = self.lines[line_index + 1]
-                            line_index += 1
-
-                            tmp8 = line[:8]
-                            val.value = tmp8
-
-                            find[i:i + 4] = val.as_bytes
-
-                            tmp8 = line[9:17]
-                            val.value = tmp8
-
-                            if i + 4 < length:
-                                find[(i + 4):(i + 4) + 4] = val.as_bytes
-
-                        pointer.value = self.search_data(self.data, len(self.data), pointer.value if t == "8" else 0, find, length, cnt)
-
-                        if pointer.value < 0:
-                            while line_index < len(self.lines):
-                                line_index += 1
-
-                                while (line and ((line[0] not in ["8", "B", "C"]) or line[1] == "8")):
-                                    if line_index >= len(self.lines):
-                                        break
-                                    
-                                    line = self.lines[line_index]
-                                    line_index += 1
-                            pointer.value = 0
-
-                    case "9":
-                        #	Pointer Manipulator (Set/Move Pointer)
-                        #	Adjusts the Pointer Offset using numerous Operators
-                        #	9Y000000 XXXXXXXX
-                        #	Y = Operator
-                        #	0 = Set Pointer to Big Endian value at XXXXXXXX
-                        #	1 = Set Pointer to Little Endian value at XXXXXXXX
-                        #	2 = Add X to Pointer
-                        #	3 = Sub X to Pointer
-                        #	4 = Set Pointer to the end of file and subtract X
-                        #	5 = Set Pointer to X
-                        #	D = Set End Address = to X
-                        #	E = Set End Address From Pointer + X
-                        #	X = Value to set / change
-                        #	---
-                        #	Move pointer to offset in address XXXXXXXXX (CONFIRMED CODE)
-                        #	90000000 XXXXXXXX
-                        #	---
-                        #	Step Forward Code (CONFIRMED CODE)
-                        #	92000000 XXXXXXXX
-                        #	---
-                        #	Step Back Code (CONFIRMED CODE)
-                        #	93000000 XXXXXXXX
-                        #	---
-                        #	Step Back From End of File Code (CONFIRMED CODE)
-                        #	94000000 XXXXXXXX
-                        tmp8 = line[9:17]
-                        off = uint32(tmp8).value
-
-                        match line[1]:
-                            case "0":
-                                val = uint32(self.data[off:off + 4], "big")
-                                pointer.value = val.value
-                            
-                            case "1":
-                                val = uint32(self.data[off:off + 4], "little")
-                                pointer.value = val.value
-                            
-                            case "2":
-                                pointer.value += off
-                            
-                            case "3":
-                                pointer.value -= off
-                            
-                            case "4": 
-                                pointer.value = len(self.data) - off
-                            
-                            case "5":
-                                pointer.value = off
-
-                            case "D":
-                                end_pointer.value = off
-
-                            case "E":
-                                end_pointer.value = pointer.value + off
-
-                    case "A":
-                        #	Multi-write
-                        #	ATxxxxxx yyyyyyyy  (xxxxxx = address, yyyyyyyy = size)
-                        #	zzzzzzzz zzzzzzzz  <-data to write at address
-                        #	T= Address/Offset type (0 = Normal / 8 = Offset From Pointer)
-                        t = line[1]
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-                        if t == "8":
-                            off.value += pointer.value
-                        off = off.value
-
-                        tmp8 = line[9:17]
-                        size = uint32(tmp8).value
-
-                        write = bytearray((size + 3) & ~3)
-
-                        for i in range(0, size, 8):
-                            line = self.lines[line_index + 1]
-                            line_index += 1
-
-                            tmp8 = line[:8]
-                            val = uint32(tmp8, "big")
-
-                            write[i:i + 4] = val.as_bytes
-
-                            tmp8 = line[9:17]
-                            val.value = tmp8
-
-                            if (i + 4) < size:
-                                write[(i + 4):(i + 4) + 4] = val.as_bytes
-                        
-                        self.data[off:off + size] = write[:size] 
-
-                    case "B":
-                        #	Backward Byte Search (Set Pointer)
-                        #	Searches Backwards for a specified Value and saves the Value's Address as the Pointer Offset
-                        #	Will start from the end of the save file, but can be changed using a previous Pointer Offset
-                        #	BTCCYYYY XXXXXXXX
-                        #	*Other Code Here, Use Specific Offset Type*
-                        #	T = Offset Type
-                        #	0 = Default
-                        #	8 = Offset from Pointer
-                        #	C = Amount of Times to Find until Pointer Set
-                        #	Y = Amount of Bytes to Search
-                        #	1 = 1 Byte
-                        #	2 = 2 Bytes
-                        #	and so on...
-                        #	X = Bytes to Search, use Multiple Lines if Needed
-                        t = line[1]
-
-                        tmp3 = line[2:4] 
-                        cnt = int32(tmp3).value
-
-                        tmp4 = line[4:8]
-                        length = int32(tmp4).value
-
-                        tmp8 = line[9:17]
-                        val = uint32(tmp8, "big")
-
-                        find = bytearray((length + 3) & ~3)
-                        if not cnt: 
-                            cnt = 1
-                        if not end_pointer.value: 
-                            end_pointer.value = len(self.data) - 1
-
-                        find[:4] = val.as_bytes
-
-                        for i in range(4, length, 8):
-                            line = self.lines[line_index + 1]
-                            line_index += 1
-
-                            tmp8 = line[:8]
-                            val.value = tmp8
-
-                            find[i:i + 4] = val.as_bytes
-
-                            tmp8 = line[9:17]
-                            val.value = tmp8
-
-                            if (i + 4) < length:
-                                find[(i + 4):(i + 4) + 4] = val.as_bytes
-
-                        pointer.value = self.reverse_search_data(self.data, len(self.data), pointer.value if t == "8" else end_pointer.value, find, length, cnt)
-                        
-                        if pointer.value < 0:
-                            while line_index < len(self.lines):
-                                line_index += 1
-
-                                while (line and ((line[0] not in ["8", "B", "C"]) or line[1] == "8")):
-                                    if line_index >= len(self.lines):
-                                        break
-                                    
-                                    line = self.lines[line_index]
-                                    line_index += 1
-                            pointer.value = 0
-                    
-                    case "C":
-                        #	Address Byte Search (Set Pointer)
-                        #	Searches for a Value from a specified Address and saves the new Value's Address as the Pointer Offset
-                        #	Rather than searching for Bytes already given such as code types 8 and B, this code will instead search using the bytes at a specific Address
-                        #	CBFFYYYY XXXXXXXX
-                        #	*Other Code Here, Use Specific Offset Type*
-                        #	B = Offset Type
-                        #	0 = Search Forwards from Address Given
-                        #	4 = Search from 0x0 to Address Given
-                        #	8 = Offset from Pointer; Search Forwards from Address Given
-                        #	C = Offset from Pointer; Search from 0x0 to Address Given
-                        #	F = Amount of Times to Find until Pointer Set
-                        #	Y = Amount of Bytes to Search from Address
-                        #	1 = 1 Byte
-                        #	2 = 2 Bytes
-                        #	and so on...
-                        #	X = Address of Bytes to Search with
-                        t = line[1]
-
-                        tmp3 = line[2:4]
-                        cnt = int32(tmp3).value
-
-                        tmp4 = line[4:8]
-                        length = int32(tmp4).value
-
-                        tmp8 = line[9:17]
-                        addr = uint32(tmp8)
-                        if t in ["8", "C"]:
-                            addr.value += pointer.value
-                        addr = addr.value
-
-                        find = self.data[addr:]
-
-                        if not cnt: 
-                            cnt = 1
-
-                        if t in ["4", "C"]:
-                            pointer.value = self.search_data(self.data, addr + length, 0, find, length, cnt)
-                        else:
-                            pointer.value = self.search_data(self.data, len(self.data), addr + length, find, length, cnt)
-
-                        if pointer.value < 0:
-                            while line_index < len(self.lines):
-                                line_index += 1
-
-                                while (line and ((line[0] not in ["8", "B", "C"]) or line[1] == "8")):
-                                    if line_index >= len(self.lines):
-                                        break
-                                    
-                                    line = self.lines[line_index]
-                                    line_index += 1
-                            pointer.value = 0
-
-                    case "D":
-                        #	2 Byte Test Commands (Code Skipper)
-                        #	Test a specific Address using an Operation; skips the following code lines if Operation fails
-                        #	DBYYYYYY CCZDXXXX
-                        #	B = Offset Type
-                        #	0 = Normal
-                        #	8 = Offset from Pointer
-                        #	Y = Address to test
-                        #	C = Lines of code to skip if test fails
-                        #	Z = Value data type
-                        #	0 = 16-bit
-                        #	1 = 8-bit
-                        #	D = Test Operation
-                        #	0 = Equal
-                        #	1 = Not Equal
-                        #	2 = Greater Than (Value at the Address is greater than the tested value)
-                        #	3 = Less Than (Value at the Address is less than the tested value)
-				        #	X = Value to test
-                        t = line[1]
-                        op = line[12]
-                        bit = line[11]
-
-                        tmp6 = line[2:8]
-                        off = int32(tmp6)
-                        if t == "8":
-                            off.value += pointer.value
-                        off = off.value
-
-                        tmp3 = line[9:11]
-                        l = int32(tmp3)
-
-                        tmp4 = line[13:17]
-                        val = int32(tmp4).value
-
-                        src = uint16(self.data[off:off + 2], "little").value
-
-                        if bit == "1":
-                            val &= 0xFF
-                            src = self.data[off]
-                        
-                        match op:
-                            case "0":
-                                off = (src == val)
-
-                            case "1":
-                                off = (src != val)
-
-                            case "2":
-                                off = (src > val)
-                            
-                            case "3":
-                                off = (src < val)
-
-                            case _:
-                                off = 1
-                        
-                        if not off:
-                            while l.value > 0:
-                                l.value -= 1
-                                line = self.lines[line_index + 1]
-                                line_index += 1
-            # except NotImplementedError:
-            #     raise QuickCodesError("A code-type you entered has not yet been implemented!")
-            except (ValueError, IOError, IndexError):
-                raise QuickCodesError("Invalid code!")
-
-            line_index += 1
+        # one handler for the whole run rather than a try block per line
+        try:
+            while line_index < count:
+                line_index = handlers[ops[line_index]](self, line_index)
+        # except NotImplementedError:
+        #     raise QuickCodesError("A code-type you entered has not yet been implemented!")
+        except (ValueError, IOError, IndexError, struct.error):
+            raise QuickCodesError("Invalid code!")
         
         await self.write_file()